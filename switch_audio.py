@@ -1,33 +1,84 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
+import ctypes
+import functools
 import glob
+import json
 import os
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
 import random
 import re
 import shlex
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 VIDEO_EXTS = {".mp4", ".mov", ".mkv", ".avi", ".m4v", ".webm"}
+VIDEO_NAME_RE = re.compile(
+    r"\.(?:" + "|".join(ext[1:] for ext in sorted(VIDEO_EXTS)) + r")$",
+    re.IGNORECASE,
+)
 INTERRUPT_RETURN_CODES = {130, 255, -2}
+CACHE_FILE = Path(".switch_audio_cache.json")
+PROBE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+RENAMEAT2 = (
+    getattr(ctypes.CDLL(None, use_errno=True), "renameat2", None)
+    if sys.platform.startswith("linux")
+    else None
+)
+BATCH_MAX_VIDEOS = 8
+
+probe_cache: dict = {}
+output_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _which(tool: str) -> str | None:
+    return shutil.which(tool)
+
+
+FFMPEG = _which("ffmpeg") or "ffmpeg"
+FFPROBE = _which("ffprobe") or "ffprobe"
+FFMPEG_BASE_CMD = (
+    FFMPEG,
+    "-hide_banner",
+    "-nostdin",
+    "-loglevel",
+    "error",
+    "-nostats",
+    "-progress",
+    "pipe:1",
+)
+FFMPEG_INPUT_ARGS = ("-fflags", "+fastseek", "-thread_queue_size", "1024")
+FFMPEG_MAP_ARGS = ("-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy")
 
 
 class UserAbort(BaseException):
     pass
 
 
+def log(*lines: str) -> None:
+    with output_lock:
+        sys.stdout.write("".join(f"{line}\n" for line in lines))
+        sys.stdout.flush()
+
+
 def which_or_die(tool):
-    if shutil.which(tool) is None:
+    if _which(tool) is None:
         raise SystemExit(f"Missing required tool: {tool}")
 
 
-def run(cmd, *, check=True):
+def run(cmd, *, check=True, input=None):
     try:
-        result = subprocess.run(cmd, check=check)
+        result = subprocess.run(cmd, check=check, input=input)
     except KeyboardInterrupt as exc:
         raise UserAbort from exc
     except subprocess.CalledProcessError as exc:
@@ -39,29 +90,237 @@ def run(cmd, *, check=True):
     return result.returncode
 
 
+def run_ffmpeg(cmd, *, label: str, duration: float) -> None:
+    next_percent = 0
+    try:
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+            for line in proc.stdout:
+                key, _, value = line.strip().partition("=")
+                if key != "out_time_us" or not value.isdigit() or duration <= 0:
+                    continue
+                percent = min(100, int(int(value) / 10_000 / duration))
+                if percent >= next_percent:
+                    log(f"{label}: {percent}%")
+                    next_percent = percent - percent % 10 + 10
+    except KeyboardInterrupt as exc:
+        raise UserAbort from exc
+    if proc.returncode in INTERRUPT_RETURN_CODES:
+        raise UserAbort
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def check_output(cmd, *, text=True) -> str | bytes:
+    try:
+        return subprocess.check_output(cmd, text=text)
+    except KeyboardInterrupt as exc:
+        raise UserAbort from exc
+    except subprocess.CalledProcessError as exc:
+        if exc.returncode in INTERRUPT_RETURN_CODES:
+            raise UserAbort from exc
+        raise
+
+
 def ffprobe_duration(path: Path) -> float:
     cmd = [
-        "ffprobe",
+        FFPROBE,
         "-v",
         "error",
+        "-analyzeduration",
+        "1000000",
+        "-probesize",
+        "1000000",
         "-show_entries",
         "format=duration",
         "-of",
         "default=nw=1:nk=1",
         str(path),
     ]
-    try:
-        out = subprocess.check_output(cmd, text=True).strip()
-    except KeyboardInterrupt as exc:
-        raise UserAbort from exc
-    except subprocess.CalledProcessError as exc:
-        if exc.returncode in INTERRUPT_RETURN_CODES:
-            raise UserAbort from exc
-        raise
+    out = check_output(cmd, text=False)
     try:
         return float(out)
     except ValueError:
-        raise SystemExit(f"Could not parse duration for {path}: {out}")
+        text = out.decode(errors="replace").strip()
+        raise SystemExit(f"Could not parse duration for {path}: {text}")
+
+
+def ffprobe_audio_format(path: Path) -> tuple[str, ...]:
+    cmd = [
+        FFPROBE,
+        "-v",
+        "error",
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "stream=codec_name,sample_rate,channels",
+        "-of",
+        "default=nw=1:nk=1",
+        str(path),
+    ]
+    return tuple(check_output(cmd).split())
+
+
+def file_key(path: Path) -> str:
+    st = path.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def lookup_cached(section: str, path: Path):
+    entry = probe_cache.setdefault(section, {}).get(os.path.abspath(path))
+    if not entry:
+        return None
+    try:
+        return entry.get(file_key(path))
+    except OSError:
+        return None
+
+
+def store_cached(section: str, path: Path, value) -> None:
+    try:
+        key = file_key(path)
+    except OSError:
+        return
+    probe_cache.setdefault(section, {})[os.path.abspath(path)] = {key: value}
+
+
+def lookup_cached_duration(path: Path) -> float | None:
+    return lookup_cached("durations", path)
+
+
+def cached_ffprobe_duration(path: Path) -> float:
+    duration = lookup_cached_duration(path)
+    if duration is not None:
+        return duration
+    duration = ffprobe_duration(path)
+    store_cached("durations", path, duration)
+    return duration
+
+
+def cached_ffprobe_audio_format(path: Path) -> tuple[str, ...]:
+    audio_format = lookup_cached("formats", path)
+    if audio_format is not None:
+        return tuple(audio_format)
+    audio_format = ffprobe_audio_format(path)
+    store_cached("formats", path, list(audio_format))
+    return audio_format
+
+
+def ffprobe_durations_batch(paths: list[Path]) -> list[float]:
+    durations = [lookup_cached_duration(path) for path in paths]
+    missing = [path for path, duration in zip(paths, durations) if duration is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(missing))) as executor:
+            probed = iter(list(executor.map(cached_ffprobe_duration, missing)))
+        durations = [next(probed) if d is None else d for d in durations]
+    return durations
+
+
+def mux_record(
+    video_path: Path,
+    final_path: Path,
+    audio_path: Path,
+    audio_codec: str,
+) -> dict:
+    return {
+        "output": file_key(final_path),
+        "video": file_key(video_path),
+        "audio": os.path.abspath(audio_path),
+        "audio_key": file_key(audio_path),
+        "codec": audio_codec,
+    }
+
+
+def is_output_current(
+    video_path: Path,
+    final_path: Path,
+    audio_path: Path,
+    audio_codec: str,
+) -> bool:
+    record = probe_cache.setdefault("outputs", {}).get(os.path.abspath(final_path))
+    if not record:
+        return False
+    try:
+        return record == mux_record(video_path, final_path, audio_path, audio_codec)
+    except OSError:
+        return False
+
+
+def remember_output(
+    video_path: Path,
+    final_path: Path,
+    audio_path: Path,
+    audio_codec: str,
+) -> None:
+    record = mux_record(video_path, final_path, audio_path, audio_codec)
+    probe_cache.setdefault("outputs", {})[os.path.abspath(final_path)] = record
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        with path.open(encoding="utf-8") as f:
+            cache = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        print(f"Warning: cache could not be read: {path} ({exc})")
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    sections = {}
+    for section in ("durations", "formats", "outputs"):
+        entries = cache.get(section)
+        if not isinstance(entries, dict):
+            continue
+        if not all(isinstance(entry, dict) for entry in entries.values()):
+            continue
+        if section == "durations" and not all(
+            isinstance(duration, (int, float))
+            for entry in entries.values()
+            for duration in entry.values()
+        ):
+            continue
+        if section == "formats" and not all(
+            isinstance(audio_format, list)
+            and all(isinstance(value, str) for value in audio_format)
+            for entry in entries.values()
+            for audio_format in entry.values()
+        ):
+            continue
+        sections[section] = entries
+    return sections
+
+
+def save_cache(path: Path, cache: dict) -> None:
+    for section in ("durations", "formats", "outputs"):
+        entries = cache.get(section, {})
+        cache[section] = {
+            cache_path: entry
+            for cache_path, entry in list(entries.items())
+            if os.path.exists(cache_path)
+        }
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        print(f"Warning: cache could not be written: {path} ({exc})")
+
+
+def atomic_swap(src: Path, dst: Path) -> None:
+    if RENAMEAT2 is not None and RENAMEAT2(
+        AT_FDCWD,
+        os.fsencode(src),
+        AT_FDCWD,
+        os.fsencode(dst),
+        RENAME_EXCHANGE,
+    ) == 0:
+        try:
+            src.unlink()
+        except OSError as exc:
+            log(f"Warning: previous video could not be deleted: {src} ({exc})")
+        return
+    os.replace(src, dst)
 
 
 def format_duration(seconds: float) -> str:
@@ -75,32 +334,30 @@ def format_duration(seconds: float) -> str:
 def print_abort_summary(
     completed_outputs: list[Path],
     total_videos: int,
-    current_video: Path | None = None,
-    current_output: Path | None = None,
+    interrupted: list[tuple[Path, Path]] | None = None,
 ) -> None:
     print()
     print("Abgebrochen durch Benutzer.")
     print(f"Status: {len(completed_outputs)}/{total_videos} Video(s) abgeschlossen.")
     if completed_outputs:
         print(f"Letztes fertiges Video: {completed_outputs[-1]}")
-    if current_video is not None:
+    for current_video, current_output in interrupted or []:
         print(f"Aktuelles Video: {current_video}")
-    if current_output is not None:
         print(f"Aktueller Output ist eventuell unvollstaendig: {current_output}")
 
 
 def delete_generated_audio(path: Path) -> None:
     try:
         path.unlink()
-        print(f"Deleted temporary audio: {path}")
+        log(f"Deleted temporary audio: {path}")
     except FileNotFoundError:
         pass
     except OSError as exc:
-        print(f"Warning: temporary audio could not be deleted: {path} ({exc})")
+        log(f"Warning: temporary audio could not be deleted: {path} ({exc})")
 
 
 def sum_durations(files: list[Path]) -> float:
-    return sum(ffprobe_duration(p) for p in files)
+    return sum(ffprobe_durations_batch(files))
 
 
 def list_mp3_files(audio_input_dir: Path) -> list[Path]:
@@ -108,13 +365,21 @@ def list_mp3_files(audio_input_dir: Path) -> list[Path]:
 
 
 def pick_mp3(audio_dir: Path, mode: str, name: str | None) -> Path | None:
-    files = [p for p in audio_dir.glob("*.mp3") if p.is_file()]
-    if not files:
+    if not audio_dir.is_dir():
+        return None
+    with os.scandir(audio_dir) as it:
+        entries = [
+            e
+            for e in it
+            if not e.name.startswith(".") and e.name.endswith(".mp3") and e.is_file()
+        ]
+    if not entries:
         return None
     if mode == "latest":
-        return max(files, key=lambda p: p.stat().st_mtime)
+        return Path(max(entries, key=lambda e: e.stat().st_mtime).path)
     if mode == "oldest":
-        return min(files, key=lambda p: p.stat().st_mtime)
+        return Path(min(entries, key=lambda e: e.stat().st_mtime).path)
+    files = [Path(e.path) for e in entries]
     if mode == "name":
         if not name:
             raise SystemExit("--audio-name is required when using --audio-pick name")
@@ -162,11 +427,11 @@ def select_audio_files_for_duration(files: list[Path], target_duration: float |
     total = 0.0
     for p in files:
         selected.append(p)
-        total += ffprobe_duration(p)
+        total += cached_ffprobe_duration(p)
         if total >= target_duration:
             break
     if total < target_duration:
-        print(
+        log(
             "Warning: audio-input shorter than video target, output audio will loop "
             f"(audio-input {format_duration(total)}, "
             f"video {format_duration(target_duration)})"
@@ -174,30 +439,55 @@ def select_audio_files_for_duration(files: list[Path], target_duration: float |
     return selected
 
 
+def can_stream_copy_mp3s(files: list[Path]) -> bool:
+    if threading.current_thread() is threading.main_thread():
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(files))) as executor:
+            formats = set(executor.map(cached_ffprobe_audio_format, files))
+    else:
+        # Already inside a --jobs worker; don't multiply the probe pool.
+        formats = {cached_ffprobe_audio_format(p) for p in files}
+    return len(formats) == 1 and next(iter(formats))[:1] == ("mp3",)
+
+
 def combine_mp3_files(files: list[Path], output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    if can_stream_copy_mp3s(files):
+        codec_args = ["-c", "copy"]
+    else:
+        log("MP3 inputs use different audio formats, re-encoding combined audio...")
+        codec_args = ["-c:a", "libmp3lame", "-q:a", "2"]
+
+    # Explicit file: URLs, so entries are not resolved relative to pipe:0.
+    concat_list = "".join(
+        "file 'file:{}'\n".format(p.resolve().as_posix().replace("'", "'\\''"))
+        for p in files
+    )
+    cmd = [
+        FFMPEG,
+        "-y",
+        "-f",
+        "concat",
+        "-safe",
+        "0",
+        "-protocol_whitelist",
+        "file,pipe",
+        "-i",
+        "pipe:0",
+        "-map",
+        "0:a",
+        *codec_args,
+        str(output_path),
+    ]
+    try:
+        run(cmd, input=concat_list.encode("utf-8"))
+        return
+    except subprocess.CalledProcessError:
+        log("Combining via stdin failed, retrying with a concat list file...")
 
     with tempfile.TemporaryDirectory() as tmpdir:
         list_path = Path(tmpdir) / "concat.txt"
-        with list_path.open("w", encoding="utf-8") as f:
-            for p in files:
-                f.write(f"file '{p.resolve().as_posix()}'\n")
-
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            str(list_path),
-            "-c:a",
-            "libmp3lame",
-            "-q:a",
-            "2",
-            str(output_path),
-        ]
+        list_path.write_text(concat_list, encoding="utf-8")
+        cmd[cmd.index("pipe:0")] = str(list_path)
         run(cmd)
 
 
@@ -222,7 +512,8 @@ def write_tracklist(
 ) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
     current = 0.0
-    audio_duration = sum_durations(files)
+    durations = ffprobe_durations_batch(files)
+    audio_duration = sum(durations)
     with output_path.open("w", encoding="utf-8") as f:
         if video_path is not None:
             f.write(f"Video: {video_path.name}\n")
@@ -230,13 +521,13 @@ def write_tracklist(
             f.write(f"Video length: {format_duration(video_duration)}\n")
         f.write(f"Audio length: {format_duration(audio_duration)}\n")
         f.write("\n")
-        for p in files:
+        for p, duration in zip(files, durations):
             display_name = p.stem
             match = re.match(r"^\d{2}[\s._-]+(.+)$", p.stem)
             if match:
                 display_name = match.group(1)
             f.write(f"{format_duration(current)} - {display_name}\n")
-            current += ffprobe_duration(p)
+            current += duration
 
 
 def create_combined_audio(
@@ -270,6 +561,15 @@ def has_glob_chars(path: Path) -> bool:
     return any(char in str(path) for char in "*?[")
 
 
+def list_video_files(video_dir: Path) -> list[Path]:
+    with os.scandir(video_dir) as entries:
+        return sorted(
+            Path(video_dir, entry.name)
+            for entry in entries
+            if VIDEO_NAME_RE.search(entry.name) and entry.is_file()
+        )
+
+
 def resolve_video_inputs(video_inputs: list[Path]) -> list[Path]:
     videos = []
     seen = set()
@@ -278,7 +578,7 @@ def resolve_video_inputs(video_inputs: list[Path]) -> list[Path]:
         if has_glob_chars(video_input):
             matches = [Path(p) for p in sorted(glob.glob(str(video_input)))]
         elif video_input.is_dir():
-            matches = [p for p in sorted(video_input.iterdir()) if p.suffix.lower() in VIDEO_EXTS]
+            matches = list_video_files(video_input)
         else:
             matches = [video_input]
 
@@ -321,8 +621,51 @@ def build_tracklist_path(video_path: Path, output_path: Path, in_place: bool) ->
     return output_path.with_suffix(".txt")
 
 
+def plan_video_outputs(
+    args: argparse.Namespace,
+    videos: list[Path],
+) -> tuple[list[tuple[Path, Path]], list[tuple[Path, str]]]:
+    outputs = [
+        (video_path, build_output_path(video_path, args.suffix, args.in_place, args.output_dir))
+        for video_path in videos
+    ]
+    writers: dict[Path, Path] = {}
+    for video_path, output_path in outputs:
+        writers.setdefault(output_path.resolve(), video_path)
+
+    planned = []
+    rejected = []
+    for video_path, output_path in outputs:
+        producer = writers.get(video_path.resolve())
+        if producer is not None and producer != video_path:
+            print(f"Skipped: {video_path} is the output of {producer} in this run")
+            continue
+        writer = writers[output_path.resolve()]
+        if writer != video_path:
+            rejected.append((video_path, f"Same output as {writer}: {output_path}"))
+            continue
+        planned.append((video_path, output_path))
+    return planned, rejected
+
+
+def build_tracklist_paths(
+    args: argparse.Namespace,
+    outputs: list[tuple[Path, Path]],
+) -> dict[Path, Path]:
+    paths = {
+        video_path: build_tracklist_path(video_path, output_path, args.in_place)
+        for video_path, output_path in outputs
+    }
+    counts = Counter(path.resolve() for path in paths.values())
+    for index, (video_path, _) in enumerate(outputs, start=1):
+        path = paths[video_path]
+        if counts[path.resolve()] > 1:
+            paths[video_path] = path.with_name(f"{path.stem}-{index}{path.suffix}")
+    return paths
+
+
 def collect_video_durations(videos: list[Path]) -> dict[Path, float]:
-    return {video_path: ffprobe_duration(video_path) for video_path in videos}
+    return dict(zip(videos, ffprobe_durations_batch(videos)))
 
 
 def print_preflight_summary(
@@ -520,6 +863,245 @@ def run_cli_assistant(args: argparse.Namespace) -> argparse.Namespace:
     return args
 
 
+def announce_video(
+    args: argparse.Namespace,
+    video_path: Path,
+    output_path: Path,
+    video_duration: float,
+    index: int,
+    total_videos: int,
+) -> None:
+    lines = [
+        "",
+        f"Processing {index}/{total_videos}: {video_path}",
+        f"Video length: {format_duration(video_duration)}",
+    ]
+    if args.in_place:
+        lines.append(f"Temporary output: {output_path}")
+        lines.append(f"Final output: {video_path}")
+    else:
+        lines.append(f"Output: {output_path}")
+    log(*lines)
+    if output_path.exists() and not args.overwrite:
+        raise RuntimeError(f"Output exists: {output_path} (use --overwrite)")
+
+
+def check_audio_shorter(audio_duration: float, video_duration: float, label: str) -> bool:
+    audio_shorter = audio_duration + 0.01 < video_duration
+    if audio_shorter:
+        log(
+            f"{label}: Warning: audio shorter than video, looping from start "
+            f"(audio {format_duration(audio_duration)}, "
+            f"video {format_duration(video_duration)})"
+        )
+    return audio_shorter
+
+
+def process_video(
+    args: argparse.Namespace,
+    video_path: Path,
+    output_path: Path,
+    video_duration: float,
+    audio_path: Path | None,
+    audio_duration: float | None,
+    *,
+    index: int,
+    total_videos: int,
+    ffmpeg_threads: int,
+    tracklist_path: Path | None = None,
+) -> Path:
+    generated_audio_path = None
+    final_path = video_path if args.in_place else output_path
+    audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
+    if not args.overwrite and audio_path is not None and is_output_current(
+        video_path,
+        final_path,
+        audio_path,
+        audio_codec,
+    ):
+        log("", f"Skipped {index}/{total_videos}, audio already up to date: {final_path}")
+        return final_path
+    try:
+        announce_video(args, video_path, output_path, video_duration, index, total_videos)
+
+        current_audio_path = audio_path
+        current_audio_duration = audio_duration
+        if args.force_shuffle_audio_input:
+            log(f"{video_path.name}: Creating shuffled audio for this video...")
+            args.audio_dir.mkdir(parents=True, exist_ok=True)
+            fd, generated_name = tempfile.mkstemp(
+                dir=args.audio_dir,
+                prefix=f"{video_path.stem}-",
+                suffix=".mp3",
+            )
+            os.close(fd)
+            generated_audio_path = Path(generated_name)
+            if tracklist_path is None:
+                tracklist_path = build_tracklist_path(video_path, output_path, args.in_place)
+            current_audio_path = create_combined_audio(
+                args.audio_input_dir,
+                args.audio_dir,
+                True,
+                output_path=generated_audio_path,
+                tracklist_path=tracklist_path,
+                target_duration=video_duration,
+                video_path=video_path,
+            )
+            current_audio_duration = cached_ffprobe_duration(current_audio_path)
+
+        log(
+            f"{video_path.name}: Audio: {current_audio_path}",
+            f"{video_path.name}: Audio length: {format_duration(current_audio_duration)}",
+        )
+        audio_shorter = check_audio_shorter(
+            current_audio_duration,
+            video_duration,
+            video_path.name,
+        )
+
+        cmd = [
+            *FFMPEG_BASE_CMD,
+            *(("-y",) if args.overwrite or args.in_place else ()),
+            *FFMPEG_INPUT_ARGS,
+            "-i",
+            str(video_path),
+            *FFMPEG_INPUT_ARGS,
+            *(("-stream_loop", "-1") if audio_shorter else ()),
+            "-i",
+            str(current_audio_path),
+            *FFMPEG_MAP_ARGS,
+            "-c:a",
+            audio_codec,
+            "-threads",
+            str(ffmpeg_threads),
+            "-shortest",
+            str(output_path),
+        ]
+
+        log(f"Running ffmpeg: {video_path.name}")
+        run_ffmpeg(cmd, label=video_path.name, duration=video_duration)
+
+        if args.in_place:
+            log(f"Replacing original video: {video_path}")
+            atomic_swap(output_path, video_path)
+        if generated_audio_path is None:
+            remember_output(video_path, final_path, current_audio_path, audio_codec)
+        log(f"Done: {final_path}")
+        return final_path
+    finally:
+        if generated_audio_path is not None:
+            delete_generated_audio(generated_audio_path)
+
+
+def group_videos_by_codec(
+    args: argparse.Namespace,
+    items: list[tuple[int, Path, Path]],
+) -> list[list[tuple[int, Path, Path]]]:
+    groups: dict[str, list[tuple[int, Path, Path]]] = {}
+    for item in items:
+        output_path = item[2]
+        audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
+        groups.setdefault(audio_codec, []).append(item)
+    return [
+        group[start:start + BATCH_MAX_VIDEOS]
+        for group in groups.values()
+        for start in range(0, len(group), BATCH_MAX_VIDEOS)
+    ]
+
+
+def process_video_group(
+    args: argparse.Namespace,
+    items: list[tuple[int, Path, Path]],
+    video_durations: dict[Path, float],
+    audio_path: Path,
+    audio_duration: float,
+    *,
+    total_videos: int,
+) -> tuple[list[Path], list[tuple[Path, str]]]:
+    audio_inputs = {}
+    input_args = []
+    output_args = []
+    for index, video_path, output_path in items:
+        video_duration = video_durations[video_path]
+        announce_video(args, video_path, output_path, video_duration, index, total_videos)
+        audio_shorter = check_audio_shorter(audio_duration, video_duration, video_path.name)
+
+        video_index = len(audio_inputs) + len(output_args)
+        input_args.extend([*FFMPEG_INPUT_ARGS, "-i", str(video_path)])
+        if audio_shorter not in audio_inputs:
+            audio_inputs[audio_shorter] = video_index + 1
+            input_args.extend(FFMPEG_INPUT_ARGS)
+            if audio_shorter:
+                input_args.extend(["-stream_loop", "-1"])
+            input_args.extend(["-i", str(audio_path)])
+
+        audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
+        output_args.append([
+            "-map",
+            f"{video_index}:v:0",
+            "-map",
+            f"{audio_inputs[audio_shorter]}:a:0",
+            "-c:v",
+            "copy",
+            "-c:a",
+            audio_codec,
+            "-threads",
+            "0",
+            "-shortest",
+            str(output_path),
+        ])
+
+    print()
+    print(f"Audio: {audio_path}")
+    print(f"Audio length: {format_duration(audio_duration)}")
+    cmd = [
+        *FFMPEG_BASE_CMD,
+        *(("-y",) if args.overwrite or args.in_place else ()),
+        *input_args,
+    ]
+    for args_for_output in output_args:
+        cmd.extend(args_for_output)
+
+    existing_outputs = {output_path for _, _, output_path in items if output_path.exists()}
+    print(f"Running ffmpeg: {len(items)} video(s) in one run")
+    try:
+        run_ffmpeg(
+            cmd,
+            label=f"{len(items)} video(s)",
+            duration=max(video_durations[video_path] for _, video_path, _ in items),
+        )
+    except Exception:
+        for _, _, output_path in items:
+            if output_path not in existing_outputs:
+                output_path.unlink(missing_ok=True)
+        raise
+
+    finished = []
+    failed = []
+    for _, video_path, output_path in items:
+        final_path = video_path
+        if args.in_place:
+            print(f"Replacing original video: {video_path}")
+            try:
+                atomic_swap(output_path, video_path)
+            except OSError as exc:
+                failed.append((
+                    video_path,
+                    f"Could not replace original video, new file kept at {output_path}: {exc}",
+                ))
+                continue
+        else:
+            final_path = output_path
+        audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
+        try:
+            remember_output(video_path, final_path, audio_path, audio_codec)
+        except OSError as exc:
+            print(f"Warning: output could not be recorded in cache: {final_path} ({exc})")
+        print(f"Done: {final_path}")
+        finished.append(final_path)
+    return finished, failed
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Replace video audio track with an MP3 from the audio folder."
@@ -633,14 +1215,37 @@ def main():
         action="store_true",
         help="Only combine audio-input MP3s into audio/ and exit.",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of videos processed in parallel (default: number of CPU cores).",
+    )
+    parser.add_argument(
+        "--batch-ffmpeg",
+        action="store_true",
+        help=(
+            "Process all videos with the same audio codec in a single ffmpeg run "
+            "instead of one ffmpeg per video (no parallel jobs)."
+        ),
+    )
 
     args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.batch_ffmpeg and args.jobs not in (None, 1):
+        parser.error("--batch-ffmpeg cannot be combined with --jobs")
+    if args.batch_ffmpeg and args.force_shuffle_audio_input:
+        parser.error("--batch-ffmpeg cannot be combined with --force-shuffle-audio-input")
     if len(sys.argv) == 1:
         args = run_cli_assistant(args)
 
     which_or_die("ffmpeg")
     which_or_die("ffprobe")
 
+    probe_cache.update(load_cache(CACHE_FILE))
+    atexit.register(save_cache, CACHE_FILE, probe_cache)
+
     if args.combine_only:
         combined = create_combined_audio(
             args.audio_input_dir,
@@ -648,7 +1253,7 @@ def main():
             args.shuffle_audio_input or args.force_shuffle_audio_input,
         )
         tracklist_path = combined.with_suffix(".txt")
-        duration = ffprobe_duration(combined)
+        duration = cached_ffprobe_duration(combined)
         print(f"Combined audio: {combined}")
         print(f"Tracklist: {tracklist_path}")
         print(f"Length: {format_duration(duration)} ({duration:.2f}s)")
@@ -664,9 +1269,9 @@ def main():
             audio_files = sorted(audio_files, key=lambda p: p.stat().st_mtime, reverse=True)
         else:
             audio_files = sorted(audio_files, key=lambda p: p.name.lower())
+        durations = ffprobe_durations_batch(audio_files)
         total = 0.0
-        for p in audio_files:
-            duration = ffprobe_duration(p)
+        for p, duration in zip(audio_files, durations):
             total += duration
             print(f"{p.name}: {format_duration(duration)} ({duration:.2f}s)")
         print(f"Total: {format_duration(total)} ({total:.2f}s)")
@@ -679,7 +1284,7 @@ def main():
         if not video_dir.exists():
             raise SystemExit(f"Video directory not found: {video_dir}")
 
-        videos = [p for p in sorted(video_dir.iterdir()) if p.suffix.lower() in VIDEO_EXTS]
+        videos = list_video_files(video_dir)
         if not videos:
             raise SystemExit(f"No video files found in {video_dir}")
 
@@ -705,116 +1310,141 @@ def main():
 
     if audio_path is not None and not audio_path.exists():
         raise SystemExit(f"Audio file not found: {audio_path}")
+    audio_duration = None
+    if audio_path is not None:
+        audio_duration = cached_ffprobe_duration(audio_path)
 
     failures = []
     completed_outputs = []
-    total_videos = len(videos)
-    print(f"Start processing: {total_videos} video(s)")
-    for index, video_path in enumerate(videos, start=1):
-        output_path = None
-        generated_audio_path = None
-        try:
-            video_duration = video_durations[video_path]
-            output_path = build_output_path(
+    outputs, rejected = plan_video_outputs(args, videos)
+    for video_path, reason in rejected:
+        failures.append((video_path, reason))
+        print(f"Failed: {video_path} ({reason})")
+    total_videos = len(outputs)
+    if args.batch_ffmpeg:
+        items = [
+            (index, video_path, output_path)
+            for index, (video_path, output_path) in enumerate(outputs, start=1)
+        ]
+        for item in list(items):
+            index, video_path, output_path = item
+            final_path = video_path if args.in_place else output_path
+            audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
+            if not args.overwrite and is_output_current(
                 video_path,
-                args.suffix,
-                args.in_place,
-                args.output_dir,
-            )
-            print()
-            print(f"Processing {index}/{total_videos}: {video_path}")
-            print(f"Video length: {format_duration(video_duration)}")
-            if args.in_place:
-                print(f"Temporary output: {output_path}")
-                print(f"Final output: {video_path}")
-            else:
-                print(f"Output: {output_path}")
-            if output_path.exists() and not args.overwrite:
-                raise RuntimeError(f"Output exists: {output_path} (use --overwrite)")
-
-            current_audio_path = audio_path
-            if args.force_shuffle_audio_input:
-                print("Creating shuffled audio for this video...")
-                generated_audio_path = args.audio_dir / f"{video_path.stem}.mp3"
-                current_audio_path = create_combined_audio(
-                    args.audio_input_dir,
-                    args.audio_dir,
-                    True,
-                    output_path=generated_audio_path,
-                    tracklist_path=build_tracklist_path(
-                        video_path,
-                        output_path,
-                        args.in_place,
-                    ),
-                    target_duration=video_duration,
-                    video_path=video_path,
+                final_path,
+                audio_path,
+                audio_codec,
+            ):
+                print(f"Skipped {index}/{total_videos}, audio already up to date: {final_path}")
+                completed_outputs.append(final_path)
+                items.remove(item)
+            elif output_path.exists() and not args.overwrite:
+                exc = f"Output exists: {output_path} (use --overwrite)"
+                failures.append((video_path, exc))
+                print(f"Failed: {video_path} ({exc})")
+                items.remove(item)
+        groups = group_videos_by_codec(args, items)
+        print(f"Start processing: {total_videos} video(s) in {len(groups)} ffmpeg run(s)")
+        for group in groups:
+            try:
+                finished, failed = process_video_group(
+                    args,
+                    group,
+                    video_durations,
+                    audio_path,
+                    audio_duration,
+                    total_videos=total_videos,
                 )
+            except UserAbort:
+                interrupted = [(video_path, output_path) for _, video_path, output_path in group]
+                print_abort_summary(completed_outputs, total_videos, interrupted)
+                raise
+            except Exception:
+                print(f"Batch ffmpeg run failed, processing {len(group)} video(s) one by one")
+                for index, video_path, output_path in group:
+                    try:
+                        completed_outputs.append(
+                            process_video(
+                                args,
+                                video_path,
+                                output_path,
+                                video_durations[video_path],
+                                audio_path,
+                                audio_duration,
+                                index=index,
+                                total_videos=total_videos,
+                                ffmpeg_threads=0,
+                            )
+                        )
+                    except UserAbort:
+                        print_abort_summary(
+                            completed_outputs,
+                            total_videos,
+                            [(video_path, output_path)],
+                        )
+                        raise
+                    except Exception as exc:
+                        failures.append((video_path, str(exc)))
+                        log(f"Failed: {video_path} ({exc})")
+            else:
+                completed_outputs.extend(finished)
+                for video_path, reason in failed:
+                    failures.append((video_path, reason))
+                    print(f"Failed: {video_path} ({reason})")
+        if failures:
+            raise SystemExit(f"{len(failures)} video(s) failed")
+        print()
+        print(f"Finished: {len(completed_outputs)}/{total_videos} video(s) completed.")
+        return
 
-            audio_duration = ffprobe_duration(current_audio_path)
-            print(f"Audio: {current_audio_path}")
-            print(f"Audio length: {format_duration(audio_duration)}")
-            audio_longer = audio_duration > (video_duration + 0.01)
-            audio_shorter = audio_duration + 0.01 < video_duration
-            if audio_shorter:
-                print(
-                    "Warning: audio shorter than video, looping from start "
-                    f"(audio {format_duration(audio_duration)}, "
-                    f"video {format_duration(video_duration)})"
+    cpu_count = os.cpu_count() or 1
+    jobs = args.jobs or min(total_videos, cpu_count)
+    # One job lets ffmpeg pick all cores; parallel jobs share them.
+    ffmpeg_threads = 0 if jobs == 1 else max(1, cpu_count // jobs)
+    print(f"Start processing: {total_videos} video(s), {jobs} parallel job(s)")
+    tracklist_paths = build_tracklist_paths(args, outputs)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {}
+        try:
+            for index, (video_path, output_path) in enumerate(outputs, start=1):
+                future = executor.submit(
+                    process_video,
+                    args,
+                    video_path,
+                    output_path,
+                    video_durations[video_path],
+                    audio_path,
+                    audio_duration,
+                    index=index,
+                    total_videos=total_videos,
+                    ffmpeg_threads=ffmpeg_threads,
+                    tracklist_path=tracklist_paths[video_path],
                 )
-
-            audio_codec = args.audio_codec or choose_audio_codec_for_path(output_path)
-
-            cmd = [
-                "ffmpeg",
-                "-hide_banner",
-                "-stats",
-                "-i",
-                str(video_path),
-            ]
-            if audio_shorter:
-                cmd.extend(["-stream_loop", "-1"])
-            cmd.extend([
-                "-i",
-                str(current_audio_path),
-                "-map",
-                "0:v:0",
-                "-map",
-                "1:a:0",
-                "-c:v",
-                "copy",
-                "-c:a",
-                audio_codec,
-            ])
-            cmd.append("-shortest")
-            if args.overwrite or args.in_place:
-                cmd.insert(1, "-y")
-            cmd.append(str(output_path))
-
-            print("Running ffmpeg...")
-            run(cmd)
-
-            if args.in_place:
-                print("Replacing original video...")
-                os.replace(output_path, video_path)
-                completed_outputs.append(video_path)
-                print(f"Done: {video_path}")
-            else:
-                completed_outputs.append(output_path)
-                print(f"Done: {output_path}")
-        except UserAbort:
-            print_abort_summary(
-                completed_outputs,
-                total_videos,
-                current_video=video_path,
-                current_output=output_path,
-            )
-            raise
-        except Exception as exc:
-            failures.append((video_path, str(exc)))
-            print(f"Failed: {video_path} ({exc})")
-        finally:
-            if generated_audio_path is not None:
-                delete_generated_audio(generated_audio_path)
+                futures[future] = (video_path, output_path)
+            for future in as_completed(futures):
+                video_path, _ = futures[future]
+                try:
+                    completed_outputs.append(future.result())
+                except UserAbort:
+                    raise
+                except Exception as exc:
+                    failures.append((video_path, str(exc)))
+                    log(f"Failed: {video_path} ({exc})")
+        except (UserAbort, KeyboardInterrupt) as exc:
+            executor.shutdown(wait=True, cancel_futures=True)
+            completed_outputs = []
+            interrupted = []
+            for future, (video_path, output_path) in futures.items():
+                if future.cancelled():
+                    continue
+                error = future.exception()
+                if error is None:
+                    completed_outputs.append(future.result())
+                elif isinstance(error, UserAbort):
+                    interrupted.append((video_path, output_path))
+            print_abort_summary(completed_outputs, total_videos, interrupted)
+            raise UserAbort from exc
 
     if failures:
         raise SystemExit(f"{len(failures)} video(s) failed")